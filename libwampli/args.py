@@ -1,39 +1,43 @@
 """Argument parsing."""
 
-import io
 import re
 import shlex
-import tokenize
 from typing import Any, Dict, Iterable, List, Mapping, MutableSequence, Optional, Pattern, Tuple, Union, Match
 
 import aiowamp
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 __all__ = ["parse_arg_value", "parse_args",
            "split_function_style", "split_arg_string", "split_kwarg",
            "parse_uri",
            "ready_uri"]
 
 # match: wamp.session.get(12345, key=value)
-RE_FUNCTION_STYLE: Pattern = re.compile(
-    r"""^
-      ((?: (?: [0-9a-z_]+\. ) | \. )* (?: [0-9a-z_]+ )?)    # match URI (1)
-      \s?
-      \(
-        (.*)                                                # arguments (2)
-      \)
-    $""",
-    re.VERBOSE,
-)
-
-
-def split_function_style(text: str) -> List[str]:
+# URI (1) and arguments (2). The URI is a flat character class so the
+# engine never has to backtrack on non-matching input.
+RE_FUNCTION_STYLE: Pattern = re.compile(r"([0-9a-z_.]*)\s?\((.*)\)")
+
+# bound method to avoid the global and attribute lookup per call
+_FN_MATCH = RE_FUNCTION_STYLE.fullmatch
+
+
+def split_function_style(text: str, _match=_FN_MATCH) -> List[str]:
     """Split a function style call text representation into its arguments.
     Returns:
         Empty list if the given string didn't match the function style,
         otherwise a list with at least the URI as its first item.
     """
-    match = RE_FUNCTION_STYLE.match(text)
+    # the pattern can only match if the text is a bracketed call, so
+    # cheap byte scans settle everything else without the regex engine.
+    if "(" not in text or not text.endswith(")"):
+        return []
+
+    match = _match(text)
     if match is None:
         return []
 
@@ -41,17 +45,35 @@ def split_function_style(text: str) -> List[str]:
     args = [uri]
 
     if arg_string:
-        token_gen = tokenize.generate_tokens(io.StringIO(arg_string).readline)
-        # get the indices of the commas in the string
-        commapos = (
-            -1,
-            *(token.end[1] for token in token_gen if token.string == ","),
-            len(arg_string) + 1,
-        )
+        # find the indices of the commas sitting at bracket depth zero
+        # with a single scan instead of running the full tokenizer.
+        commapos = [-1]
+        depth = 0
+        quote = None
+        escaped = False
+
+        for i, c in enumerate(arg_string):
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif quote is not None:
+                if c == quote:
+                    quote = None
+            elif c in "\"'":
+                quote = c
+            elif c in "([{":
+                depth += 1
+            elif c in ")]}":
+                depth -= 1
+            elif c == "," and depth == 0:
+                commapos.append(i)
+
+        commapos.append(len(arg_string))
 
         args.extend([
-            arg_string[commapos[i] + 1: commapos[i + 1] - 1]
-            for i in range(len(commapos) - 1)
+            arg_string[a + 1:b].strip()
+            for a, b in zip(commapos, commapos[1:])
         ])
 
     return args
@@ -59,26 +81,101 @@ def split_function_style(text: str) -> List[str]:
 
 def split_arg_string(arg: str) -> List[str]:
     """Split an argument string into its arguments"""
-    res = split_function_style(arg)
-    return res or shlex.split(arg)
-
+    # same quick check as split_function_style so the common shlex-style
+    # input doesn't even pay for the call.
+    if "(" in arg and arg.endswith(")"):
+        res = split_function_style(arg)
+        if res:
+            return res
 
-# match: key=value
-RE_KWARGS_MATCH: Pattern = re.compile(r"^([a-z][a-z0-9_]{2,})\s*=(.+)$")
+    return shlex.split(arg)
 
 
 def split_kwarg(arg: str) -> Tuple[Optional[str], str]:
-    match = RE_KWARGS_MATCH.match(arg)
-    if match is None:
-        return None, arg
+    """Split a key=value argument into key and value.
 
-    k, v = match.groups()
-    return k, v
+    Returns:
+        2-tuple (key, value). If the argument isn't a keyword argument
+        the key is `None` and the value is the unchanged argument.
+    """
+    # keys are at least 3 characters long, so the separator can't
+    # appear any earlier.
+    eq = arg.find("=", 3)
+    if eq < 0:
+        return None, arg
 
+    value = arg[eq + 1:]
+    if not value or "\n" in value:
+        return None, arg
 
-def parse_arg_value(val: str) -> Any:
+    key = arg[:eq].rstrip()
+    # lowercase ascii identifier of at least 3 characters which doesn't
+    # start with an underscore, like the old ^[a-z][a-z0-9_]{2,} regex.
+    if len(key) >= 3 and key[0] != "_" and key.isascii() \
+            and key.isidentifier() and key.islower():
+        return key, value
+
+    return None, arg
+
+
+# common scalar shapes which don't need the YAML machinery.
+# deliberately conservative so the results match YAML 1.1 resolution
+# (e.g. "007" is octal and "1e3" is a string in YAML).
+# ASCII so unicode digits fall through to YAML, which treats them as
+# strings. The bare-dot alternative takes no sign for the same reason.
+RE_INT: Pattern = re.compile(r"[-+]?(?:0|[1-9]\d*)", re.ASCII)
+RE_FLOAT: Pattern = re.compile(r"[-+]?(?:0|[1-9]\d*)\.\d*|\.\d+", re.ASCII)
+
+# all spellings YAML 1.1 resolves to booleans and null. "y"/"n" are
+# deliberately absent, the resolver treats them as strings.
+_SCALAR_CONSTANTS = {
+    "": None, "~": None,
+    "null": None, "Null": None, "NULL": None,
+    "true": True, "True": True, "TRUE": True,
+    "false": False, "False": False, "FALSE": False,
+    "yes": True, "Yes": True, "YES": True,
+    "no": False, "No": False, "NO": False,
+    "on": True, "On": True, "ON": True,
+    "off": False, "Off": False, "OFF": False,
+}
+
+# cache for values which went through YAML. Shell-like clients re-enter
+# the same tokens constantly, so the second parse becomes a dict lookup.
+# Only immutable results are kept, a cached list or dict could be
+# mutated by the caller.
+_PARSE_CACHE: Dict[str, Any] = {}
+_PARSE_CACHE_MAX = 1024
+
+
+def parse_arg_value(val: str, _loader=_YamlLoader) -> Any:
     """Parse a string value into its Python representation."""
-    return yaml.safe_load(val)
+    text = val.strip()
+    try:
+        return _SCALAR_CONSTANTS[text]
+    except KeyError:
+        pass
+
+    if text[0].isdigit() or text[0] in "+-.":
+        if RE_INT.fullmatch(text):
+            return int(text)
+        if RE_FLOAT.fullmatch(text):
+            return float(text)
+    elif text.isidentifier():
+        # bare words (uris aside, the most common shell tokens) always
+        # resolve to themselves. Timestamps, sexagesimals and the like
+        # all contain characters which aren't legal in identifiers.
+        return text
+
+    try:
+        return _PARSE_CACHE[val]
+    except KeyError:
+        pass
+
+    value = yaml.load(val, Loader=_loader)
+    if isinstance(value, (str, int, float)) and len(_PARSE_CACHE) < _PARSE_CACHE_MAX:
+        _PARSE_CACHE[val] = value
+
+    return value
 
 
 def parse_args(args: Union[Iterable[str], str]) -> Tuple[List[Any], Dict[str, Any]]:
@@ -94,14 +191,14 @@ def parse_args(args: Union[Iterable[str], str]) -> Tuple[List[Any], Dict[str, An
     _args: List[Any] = []
     _kwargs: Dict[str, Any] = {}
 
-    for arg in args:
-        key, raw_value = split_kwarg(arg)
-        value = parse_arg_value(raw_value)
+    append = _args.append
 
+    for arg in args:
+        key, value = split_kwarg(arg)
         if key is None:
-            _args.append(value)
+            append(parse_arg_value(value))
         else:
-            _kwargs[key] = value
+            _kwargs[key] = parse_arg_value(value)
 
     return _args, _kwargs
 
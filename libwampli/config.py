@@ -1,10 +1,10 @@
 import dataclasses
-from typing import List, Union
+from typing import List, Optional, Union
 
 __all__ = ["ConnectionConfig"]
 
 
-@dataclasses.dataclass()
+@dataclasses.dataclass(eq=False)
 class ConnectionConfig:
     """Config for a WAMP connection.
 
@@ -12,9 +12,14 @@ class ConnectionConfig:
         realm (str): Realm to connect to
         transports (Union[str, List[dict]]): Transports to use.
     """
+    __slots__ = ("realm", "transports", "_endpoint")
+
     realm: str
     transports: Union[str, List[dict]]
 
+    def __post_init__(self) -> None:
+        self._endpoint: Optional[str] = None
+
     def __str__(self) -> str:
         return f"(realm={self.realm}, endpoint={self.endpoint})"
 
@@ -25,10 +30,17 @@ class ConnectionConfig:
         Not necessarily the correct router url if multiple transports
         were specified.
         """
-        if isinstance(self.transports, str):
-            return self.transports
+        endpoint = self._endpoint
+        if endpoint is not None:
+            return endpoint
 
-        try:
-            return self.transports[0]["url"]
-        except (IndexError, KeyError):
-            raise ValueError("No transport given") from None
+        if isinstance(self.transports, str):
+            endpoint = self.transports
+        else:
+            try:
+                endpoint = self.transports[0]["url"]
+            except (IndexError, KeyError):
+                raise ValueError("No transport given") from None
+
+        self._endpoint = endpoint
+        return endpoint
@@ -1,4 +1,7 @@
-from typing import AsyncContextManager, Optional
+import asyncio
+import threading
+import weakref
+from typing import AsyncContextManager, Dict, List, Optional, Tuple
 
 import aiowamp
 
@@ -6,19 +9,79 @@ from .config import ConnectionConfig
 
 __all__ = ["ClientContextManager"]
 
+# clients shared between context managers. Each event loop gets its own
+# pool keyed by endpoint and realm; the pools live in a weak mapping so
+# entries a dead loop left behind disappear with it instead of being
+# handed to an unrelated loop later. The second entry is a refcount of
+# the managers currently holding the client; the client is closed when
+# it drops to zero.
+_PoolKey = Tuple[str, str]
+_Pool = Dict[_PoolKey, List]
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Pool]" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
 
 class ClientContextManager(AsyncContextManager[aiowamp.ClientABC]):
     _config: ConnectionConfig
     _client: Optional[aiowamp.ClientABC]
+    _pool: Optional[_Pool]
+    _key: Optional[_PoolKey]
 
     def __init__(self, config: ConnectionConfig) -> None:
         self._config = config
         self._client = None
+        self._pool = None
+        self._key = None
 
     async def __aenter__(self) -> aiowamp.ClientABC:
-        self._client = await aiowamp.connect(self._config.endpoint, realm=self._config.realm)
-        return self._client
+        loop = asyncio.get_event_loop()
+        key = (self._config.endpoint, self._config.realm)
+        self._key = key
+
+        with _clients_lock:
+            pool = _pools.get(loop)
+            if pool is None:
+                pool = _pools[loop] = {}
+
+            self._pool = pool
+
+            entry = pool.get(key)
+            if entry is not None:
+                entry[1] += 1
+                self._client = entry[0]
+                return self._client
+
+        client = await aiowamp.connect(self._config.endpoint, realm=self._config.realm)
+
+        with _clients_lock:
+            entry = pool.get(key)
+            if entry is None:
+                pool[key] = [client, 1]
+            else:
+                entry[1] += 1
+
+        if entry is not None:
+            # someone else finished connecting first, share their client
+            await client.close()
+            client = entry[0]
+
+        self._client = client
+        return client
 
     async def __aexit__(self, *_) -> None:
-        if self._client:
-            await self._client.close()
+        client = self._client
+        if client is None:
+            return
+
+        self._client = None
+
+        with _clients_lock:
+            entry = self._pool.get(self._key)
+            if entry is not None and entry[0] is client:
+                entry[1] -= 1
+                if entry[1] > 0:
+                    return
+
+                del self._pool[self._key]
+
+        await client.close()
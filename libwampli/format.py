@@ -1,14 +1,41 @@
 """Formatting WAMP related things."""
 
 import dataclasses
+import io
 import json
-from typing import Any, Iterable, Mapping
+import re
+from typing import Any, Dict, Iterable, Mapping
 
 import yaml
 from aiowamp.args_mixin import ArgsMixin
 
 from .args import split_kwarg
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    import warnings
+
+    warnings.warn(
+        "PyYAML was installed without the libyaml C extension, "
+        "YAML formatting will be noticeably slower. Install the libyaml "
+        "system package and reinstall pyyaml to get it.",
+        RuntimeWarning, stacklevel=2,
+    )
+
+    from yaml import SafeDumper as _YamlDumper
+
+# resolved once so the hot formatting paths don't re-do the attribute
+# lookups per call
+_yaml_dump = yaml.dump
+_YAMLError = yaml.YAMLError
+
+# types whose human representation is just str()
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+# memoised dataclasses.is_dataclass answers per type
+_IS_DATACLASS: Dict[type, bool] = {}
+
 __all__ = ["repr_arg_value", "format_function_style",
            "human_repr", "human_result",
            "indent_multiline",
@@ -22,9 +49,11 @@ def repr_arg_value(val: Any) -> str:
     the value.
     """
     try:
-        return json.dumps(val)
-    except ValueError:
-        return yaml.safe_dump(val)
+        return json.dumps(val, separators=(",", ":"))
+    except (TypeError, ValueError):
+        # flow style keeps the value on a single line so it can sit
+        # inside a function style argument list.
+        return _yaml_dump(val, Dumper=_YamlDumper, default_flow_style=True)
 
 
 def format_function_style(args: Iterable[Any], kwargs: Mapping[str, Any] = None) -> str:
@@ -45,9 +74,9 @@ def format_function_style(args: Iterable[Any], kwargs: Mapping[str, Any] = None)
     except StopIteration:
         raise ValueError("No uri in args") from None
 
-    if kwargs is None:
-        arg_strs = []
+    parts = []
 
+    if kwargs is None:
         for arg in arg_iter:
             if isinstance(arg, str):
                 key, value = split_kwarg(arg)
@@ -56,19 +85,14 @@ def format_function_style(args: Iterable[Any], kwargs: Mapping[str, Any] = None)
                 value = repr_arg_value(arg)
 
             if key is None:
-                arg_strs.append(value)
+                parts.append(value)
             else:
-                arg_strs.append(f"{key}={value}")
-
-        args_str = ", ".join(arg_strs)
+                parts.append(f"{key}={value}")
     else:
-        args_str = ", ".join(map(repr_arg_value, arg_iter))
-
-        kwargs_str = ", ".join(f"{key}={repr_arg_value(value)}" for key, value in kwargs.items())
-        if kwargs_str:
-            args_str += f", {kwargs_str}"
+        parts.extend(map(repr_arg_value, arg_iter))
+        parts.extend(f"{key}={repr_arg_value(value)}" for key, value in kwargs.items())
 
-    return f"{uri}({args_str})"
+    return f"{uri}({', '.join(parts)})"
 
 
 def human_repr(o: Any) -> str:
@@ -76,20 +100,104 @@ def human_repr(o: Any) -> str:
 
     The output is similar to YAML.
     """
-    if dataclasses.is_dataclass(o):
-        return str(o)
+    if isinstance(o, _PRIMITIVES):
+        return o if isinstance(o, str) else _scalar_str(o)
+
+    t = type(o)
+    is_dataclass = _IS_DATACLASS.get(t)
+    if is_dataclass is None:
+        is_dataclass = _IS_DATACLASS[t] = dataclasses.is_dataclass(t)
+
+    if is_dataclass:
+        # render the fields like a mapping instead of relying on the
+        # dataclass repr
+        return human_repr(dataclasses.asdict(o))
 
     if isinstance(o, ArgsMixin):
         return format_args_mixin(o)
 
+    # common result shapes (flat lists and string-keyed mappings of
+    # scalars) are emitted directly, skipping the YAML machinery while
+    # producing the same block style output.
+    if isinstance(o, list) and o and all(map(_is_simple_scalar, o)):
+        return "".join([f"- {_scalar_str(x)}\n" for x in o])
+
+    if isinstance(o, dict) and o and all(
+            isinstance(k, str) and _is_plain_str(k) and _is_simple_scalar(v)
+            for k, v in o.items()):
+        return "".join([f"{k}: {_scalar_str(v)}\n" for k, v in o.items()])
+
+    return _yaml_repr(o)
+
+
+# strings the emitter prints unquoted and the resolver reads back
+# unchanged: ascii, starting with a letter, free of YAML punctuation
+# and not ending in a space. Anything else goes through the dumper.
+_RE_PLAIN_STR = re.compile(r"[A-Za-z][\w ./@-]*(?<! )", re.ASCII)
+
+# spellings the resolver could read back as a bool or null, in any
+# casing so e.g. "True" is quoted as well.
+_RESOLVER_WORDS = frozenset(("true", "false", "yes", "no", "on", "off", "null"))
+
+
+def _is_plain_str(s: str) -> bool:
+    return _RE_PLAIN_STR.fullmatch(s) is not None \
+        and s.lower() not in _RESOLVER_WORDS
+
+
+def _is_simple_scalar(x: Any) -> bool:
+    if isinstance(x, str):
+        return _is_plain_str(x)
+
+    return x is None or isinstance(x, (int, float))
+
+
+_INF = float("inf")
+
+
+def _scalar_str(x: Any) -> str:
+    if x is True:
+        return "true"
+    if x is False:
+        return "false"
+    if x is None:
+        return "null"
+
+    if isinstance(x, float):
+        # YAML spellings for the specials
+        if x != x:
+            return ".nan"
+        if x == _INF:
+            return ".inf"
+        if x == -_INF:
+            return "-.inf"
+
+        s = repr(x)
+        # the emitter writes exponent floats with a dot ("1.0e+20"),
+        # without it the resolver would read the scalar back as a string
+        if "." not in s and "e" in s:
+            s = s.replace("e", ".0e", 1)
+
+        return s
+
+    return str(x)
+
+
+def _yaml_repr(o: Any) -> str:
+    # dumping into an explicit stream skips the conditional stream
+    # setup inside yaml.dump_all
+    buf = io.StringIO()
     try:
-        s = yaml.dump(o)
-    except yaml.YAMLError:
+        _yaml_dump(o, buf, Dumper=_YamlDumper, default_flow_style=False)
+    except _YAMLError:
         return str(o)
 
+    s = buf.getvalue()
+
     # we don't really care about the document termination
-    # and the newlines
-    if s.endswith("\n...\n"):
+    # and the newlines. Only scalar documents (e.g. dates) carry it,
+    # collections never do.
+    if s[-5:] == "\n...\n":
         return s[:-5]
     else:
         return s
@@ -116,38 +224,43 @@ def indent_multiline(s: str, indentation: str = "  ", add_newlines: bool = True)
         add_newlines: Whether to add newlines surrounding the result
             if indentation was added.
     """
-    lines = s.splitlines()
-    if len(lines) <= 1:
+    # a trailing newline doesn't count as an extra line
+    body = s[:-1] if s.endswith("\n") else s
+    if "\n" not in body:
         return s
 
-    lines_str = "\n".join(f"{indentation}{line}" for line in lines)
+    body = indentation + body.replace("\n", f"\n{indentation}")
     if add_newlines:
-        return f"\n{lines_str}\n"
+        return f"\n{body}\n"
     else:
-        return lines_str
+        return body
 
 
-def format_args(args: Iterable[Any]) -> str:
+def format_args(args: Iterable[Any], _repr=human_repr, _indent=indent_multiline) -> str:
     """Format the arguments into a human readable format.
 
     Uses `human_repr`.
     """
-    return ", ".join(indent_multiline(human_repr(arg)) for arg in args)
+    return ", ".join([_indent(_repr(arg)) for arg in args])
 
 
-def format_kwargs(kwargs: Mapping[str, Any]) -> str:
+def format_kwargs(kwargs: Mapping[str, Any], _repr=human_repr, _indent=indent_multiline) -> str:
     """Format the keyword arguments into a human readable format.
 
     Uses `human_repr`.
     """
-    return "\n".join(f"  {key} = {indent_multiline(human_repr(value))}"
-                     for key, value in kwargs.items())
+    return "\n".join([f"  {key} = {_indent(_repr(value))}"
+                      for key, value in kwargs.items()])
 
 
 def format_args_mixin(result: ArgsMixin) -> str:
-    args = format_args(result.args)
-    kwargs = format_kwargs(result.kwargs)
-    if args and kwargs:
-        return f"Args: {args}\n\nKwargs:\n{kwargs}"
+    args = result.args
+    kwargs = result.kwargs
+
+    args_str = format_args(args) if args else ""
+    kwargs_str = format_kwargs(kwargs) if kwargs else ""
+
+    if args_str and kwargs_str:
+        return f"Args: {args_str}\n\nKwargs:\n{kwargs_str}"
 
-    return args or kwargs
+    return args_str or kwargs_str
@@ -10,6 +10,8 @@ import libwampli
     ("a()", ["a"]),
     ("a.b(hello, world)", ["a.b", "hello", "world"]),
     ("test(key=value)", ["test", "key=value"]),
+    ("a.b(\"hello, world\", x)", ["a.b", "\"hello, world\"", "x"]),
+    ("a.b([1, 2], {c: 3})", ["a.b", "[1, 2]", "{c: 3}"]),
 ])
 def test_split_function_style(inp: str, expected: List[str]):
     assert libwampli.split_function_style(inp) == expected
@@ -33,6 +35,31 @@ def test_split_kwarg(inp: str, expected: Tuple[Optional[str], str]):
     assert libwampli.split_kwarg(inp) == expected
 
 
+@pytest.mark.parametrize("inp,expected", [
+    ("5", 5),
+    ("-3", -3),
+    ("3.14", 3.14),
+    (".5", .5),
+    ("-.5", "-.5"),
+    ("+.5", "+.5"),
+    ("1٥", "1٥"),
+    ("007", 7),
+    ("008", "008"),
+    ("1e3", "1e3"),
+    ("true", True),
+    ("yes", True),
+    ("Off", False),
+    ("None", "None"),
+    ("y", "y"),
+    ("", None),
+    ("~", None),
+    ("hello", "hello"),
+    ("[1, 2]", [1, 2]),
+])
+def test_parse_arg_value(inp: str, expected: Any):
+    assert libwampli.parse_arg_value(inp) == expected
+
+
 @pytest.mark.parametrize("inp,expected", [
     (
             ("hello", "55", "[a, 3., c]", "key=value", "val=5"),
@@ -8,12 +8,31 @@ import libwampli
 @pytest.mark.parametrize("i,e", [
     ("hello", "hello"),
     (5, "5"),
+    (True, "true"),
+    (None, "null"),
+    (float("inf"), ".inf"),
+    (1e20, "1.0e+20"),
+    ([1e-5], "- 1.0e-05\n"),
     (["hey", "there"], "- hey\n- there\n"),
+    ([1, True, None], "- 1\n- true\n- null\n"),
+    (["a: b", "true", ""], "- 'a: b'\n- 'true'\n- ''\n"),
+    ({"a": 1, "b": "hey"}, "a: 1\nb: hey\n"),
+    ({"a: b": 1}, "'a: b': 1\n"),
 ])
 def test_human_repr(i: Any, e: str):
     assert libwampli.human_repr(i) == e
 
 
+@pytest.mark.parametrize("i,e", [
+    ("hello", "hello"),
+    ("hello\n", "hello\n"),
+    ("a\nb", "\n  a\n  b\n"),
+    ("a\nb\n", "\n  a\n  b\n"),
+])
+def test_indent_multiline(i: str, e: str):
+    assert libwampli.indent_multiline(i) == e
+
+
 def test_format_function_style():
     args = ["wamp.session.get", 123456789, "key=value"]
     assert libwampli.format_function_style(args) == "wamp.session.get(123456789, key=value)"
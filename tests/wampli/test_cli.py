@@ -0,0 +1,14 @@
+import wampli.cli
+
+
+def test_event_buffer(capsysbinary):
+    buffer = wampli.cli._EventBuffer(lambda event: f"event: {event}")
+
+    buffer.add(1)
+    buffer.add(2)
+    buffer.flush()
+    assert capsysbinary.readouterr().out == b"event: 1\nevent: 2\n"
+
+    # an empty buffer shouldn't write at all
+    buffer.flush()
+    assert capsysbinary.readouterr().out == b""
@@ -1,7 +1,20 @@
 """WAMPli is a command line interface for the WAMP protocol."""
 
-import libwampli
-from .shell import *
+from typing import Any
 
-__author__ = libwampli.__author__
-__version__ = libwampli.__version__
+__all__ = ["Task", "STOP_SIGNAL", "worker", "WorkerHandle",
+           "Shell"]
+
+
+def __getattr__(name: str) -> Any:
+    # the shell drags in the entire WAMP stack, so it's loaded lazily.
+    # Importing wampli for the cli entry point stays cheap this way.
+    if name in __all__:
+        from . import shell
+        return getattr(shell, name)
+
+    if name in ("__author__", "__version__"):
+        import libwampli
+        return getattr(libwampli, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
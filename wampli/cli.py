@@ -1,24 +1,31 @@
 """WAMPli cli."""
 
+from __future__ import annotations
+
 import argparse
 import asyncio
 import signal
 import sys
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Optional
 
-import aiowamp
+# aiowamp, libwampli and wampli are imported lazily by the commands
+# that need them, so invocations like `wampli --help` don't pay for
+# loading the whole WAMP stack.
 
-import libwampli
-import wampli
 
+def _add_uri_argument(p, **kwargs) -> None:
+    p.add_argument("uri", help="WAMP URI", **kwargs)
 
-def get_parser() -> argparse.ArgumentParser:
-    """Create the argument parser for the wampli cli.
 
-    Resulting args contain the special value `entrypoint_func` which
-    is either a function which should be called with the args or `None` if no
-    subcommand was selected.
-    """
+def _add_procedure_args_arguments(p) -> None:
+    _add_uri_argument(p)
+    p.add_argument("args",
+                   help="Arguments to provide. Use key=value for keyword arguments",
+                   nargs="*")
+
+
+def _base_parser() -> argparse.ArgumentParser:
+    """Create the parser without any subcommands."""
     parser = argparse.ArgumentParser("wampli", description="A command line interface for the WAMP protocol.")
     parser.set_defaults(entrypoint_func=None)
 
@@ -27,42 +34,81 @@ def get_parser() -> argparse.ArgumentParser:
     # parser.add_argument("--ignore-config", action="store_true", default=False,
     #                     help="don't search for a config file")
 
-    def add_wamp_argument_group(p) -> None:
-        wamp = p.add_argument_group("wamp arguments", description="Arguments for WAMP")
-        wamp.add_argument("-u", "--url", help="url of the WAMP router to connect to", required=True)
-        wamp.add_argument("-r", "--realm", help="realm to join", required=True)
+    wamp = parser.add_argument_group("wamp arguments", description="Arguments for WAMP")
+    wamp.add_argument("-u", "--url", help="url of the WAMP router to connect to", required=True)
+    wamp.add_argument("-r", "--realm", help="realm to join", required=True)
 
-    def add_uri_argument(p, **kwargs) -> None:
-        p.add_argument("uri", help="WAMP URI", **kwargs)
-
-    def add_procedure_args_arguments(p) -> None:
-        add_uri_argument(p)
-        p.add_argument("args",
-                       help="Arguments to provide. Use key=value for keyword arguments",
-                       nargs="*")
-
-    add_wamp_argument_group(parser)
+    return parser
 
-    subparsers = parser.add_subparsers(title="commands")
 
+def _build_call(subparsers) -> None:
     call = subparsers.add_parser("call", help="call a procedure")
     call.set_defaults(entrypoint_func=_call_cmd)
-    add_procedure_args_arguments(call)
+    _add_procedure_args_arguments(call)
 
+
+def _build_publish(subparsers) -> None:
     publish = subparsers.add_parser("publish", help="publish to a topic")
     publish.set_defaults(entrypoint_func=_publish_cmd)
-    add_procedure_args_arguments(publish)
+    _add_procedure_args_arguments(publish)
+
 
+def _build_subscribe(subparsers) -> None:
     subscribe = subparsers.add_parser("subscribe", help="subscribe to a topic")
     subscribe.set_defaults(entrypoint_func=_subscribe_cmd)
-    add_uri_argument(subscribe, nargs="*")
+    _add_uri_argument(subscribe, nargs="*")
 
+
+def _build_shell(subparsers) -> None:
     shell = subparsers.add_parser("shell", help="start the interactive shell")
     shell.set_defaults(entrypoint_func=_shell_cmd)
 
+
+_SUBCOMMANDS = {
+    "call": _build_call,
+    "publish": _build_publish,
+    "subscribe": _build_subscribe,
+    "shell": _build_shell,
+}
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the wampli cli.
+
+    Resulting args contain the special value `entrypoint_func` which
+    is either a function which should be called with the args or `None` if no
+    subcommand was selected.
+    """
+    parser = _base_parser()
+
+    subparsers = parser.add_subparsers(title="commands")
+    for build in _SUBCOMMANDS.values():
+        build(subparsers)
+
     return parser
 
 
+# options of the base parser which consume the following argument.
+_WAMP_OPTS = frozenset(("-u", "--url", "-r", "--realm"))
+
+
+def _peek_command(argv) -> Optional[str]:
+    """Find the subcommand in the arguments without parsing them.
+
+    Returns `None` if no subcommand can be identified.
+    """
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in _WAMP_OPTS:
+            skip = True
+        elif arg in _SUBCOMMANDS:
+            return arg
+
+    return None
+
+
 def get_connection_config(args: argparse.Namespace) -> libwampli.ConnectionConfig:
     """Create a connection config from the cli args.
 
@@ -72,6 +118,8 @@ def get_connection_config(args: argparse.Namespace) -> libwampli.ConnectionConfi
     Returns:
         Connection configuration for `libwampli`
     """
+    import libwampli
+
     return libwampli.ConnectionConfig(realm=args.realm, transports=args.url)
 
 
@@ -85,47 +133,41 @@ def get_client_context(args: argparse.Namespace) -> libwampli.ClientContextManag
         Context manager for `libwampli.Connection` configured
         to the router denoted by the arguments.
     """
-    return libwampli.ClientContextManager(get_connection_config(args))
+    import libwampli
 
+    return libwampli.ClientContextManager(get_connection_config(args))
 
-def _run_async(loop: asyncio.AbstractEventLoop, coro: Awaitable) -> Any:
-    """Run a coroutine.
 
-    Does some special signal handling to perform a graceful exit.
+async def _with_signals(coro: Awaitable) -> Any:
+    """Await the coroutine with signal handlers for a graceful exit.
 
     Args:
-        loop: Event loop to run coroutine in.
-        coro: Coroutine to run
+        coro: Coroutine to run.
 
     Returns:
         Result of the coroutine.
     """
+    loop = asyncio.get_running_loop()
 
     def graceful_exit() -> None:
-        pending = asyncio.Task.all_tasks()
-        for task in pending:
-            task.cancel()
-
-        loop.stop()
+        for task in asyncio.all_tasks(loop):
+            if not task.done():
+                task.cancel()
 
-    try:
+    # signal handlers aren't supported on Windows
+    if sys.platform != "win32":
         loop.add_signal_handler(signal.SIGINT, graceful_exit)
         loop.add_signal_handler(signal.SIGTERM, graceful_exit)
-    except NotImplementedError:
-        pass
 
-    try:
-        return loop.run_until_complete(coro)
-    except KeyboardInterrupt:
-        print("Exiting")
-
-    loop.close()
+    return await coro
 
 
 def _run_async_cmd(cmd: Callable[[], Any]) -> Any:
     """Run the coroutine and return its return value."""
-    loop = asyncio.get_event_loop()
-    _run_async(loop, cmd())
+    try:
+        return asyncio.run(_with_signals(cmd()))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("Exiting")
 
 
 def _run_cmd(cmd: Callable[[], Any]) -> None:
@@ -134,6 +176,10 @@ def _run_cmd(cmd: Callable[[], Any]) -> None:
     Uses `_run_async_cmd` to run the command, but handles return values
     and exceptions.
     """
+    import aiowamp
+
+    import libwampli
+
     try:
         result = _run_async_cmd(cmd)
     except aiowamp.ErrorResponse as e:
@@ -144,6 +190,7 @@ def _run_cmd(cmd: Callable[[], Any]) -> None:
 
 def _call_cmd(args: argparse.Namespace) -> None:
     """Call command."""
+    import libwampli
 
     async def cmd() -> Any:
         async with get_client_context(args) as client:
@@ -155,6 +202,7 @@ def _call_cmd(args: argparse.Namespace) -> None:
 
 def _publish_cmd(args: argparse.Namespace) -> None:
     """Publish command."""
+    import libwampli
 
     async def cmd() -> None:
         async with get_client_context(args) as session:
@@ -164,19 +212,58 @@ def _publish_cmd(args: argparse.Namespace) -> None:
     _run_cmd(cmd)
 
 
+class _EventBuffer:
+    """Collects formatted events until the next flush.
+
+    A busy topic costs one write syscall per flush instead of one
+    per event.
+    """
+
+    def __init__(self, format_event: Callable[[Any], str]) -> None:
+        self._format_event = format_event
+        self._buffer = bytearray()
+
+    def add(self, event: Any) -> None:
+        self._buffer.extend(self._format_event(event).encode("utf-8"))
+        self._buffer += b"\n"
+
+    def flush(self) -> None:
+        if self._buffer:
+            sys.stdout.buffer.write(self._buffer)
+            sys.stdout.buffer.flush()
+            self._buffer.clear()
+
+
 def _subscribe_cmd(args: argparse.Namespace) -> None:
     """Subscribe command."""
+    import libwampli
 
-    def on_event(event: aiowamp.SubscriptionEventABC) -> None:
-        print(libwampli.format_args_mixin(event))
+    buffer = _EventBuffer(libwampli.format_args_mixin)
+
+    async def flush_loop() -> None:
+        while True:
+            await asyncio.sleep(.05)
+            buffer.flush()
 
     async def cmd() -> None:
         async with get_client_context(args) as client:
-            coro_gen = (client.subscribe(uri, on_event) for uri in args.uri)
-            await asyncio.gather(*coro_gen)
-            print(f"subscribed to {len(args.uri)} topic(s)")
+            # don't flood the router with an unbounded amount of
+            # concurrent subscribe requests.
+            sem = asyncio.Semaphore(32)
+
+            async def subscribe(uri: str) -> None:
+                async with sem:
+                    await client.subscribe(uri, buffer.add)
 
-            await client.wait_until_done()
+            await asyncio.gather(*[subscribe(uri) for uri in args.uri])
+            print(f"subscribed to {len(args.uri)} topic(s)", flush=True)
+
+            flush_task = asyncio.get_event_loop().create_task(flush_loop())
+            try:
+                await client.wait_until_done()
+            finally:
+                flush_task.cancel()
+                buffer.flush()
 
     _run_cmd(cmd)
 
@@ -186,13 +273,24 @@ def _shell_cmd(args: argparse.Namespace) -> None:
 
     Creates a new `wampli.Shell` and runs it.
     """
+    import wampli
+
     shell = wampli.Shell(get_connection_config(args))
     shell.run()
 
 
 def main() -> None:
     """Entry point for the cli"""
-    parser = get_parser()
+    cmd = _peek_command(sys.argv[1:])
+    if cmd is None:
+        # no (or an unknown) subcommand, possibly --help. Build the
+        # full parser so usage and errors list every command.
+        parser = get_parser()
+    else:
+        # only build the subparser that's actually dispatched to.
+        parser = _base_parser()
+        _SUBCOMMANDS[cmd](parser.add_subparsers(title="commands"))
+
     args = parser.parse_args()
     func = args.entrypoint_func
 
@@ -200,6 +298,15 @@ def main() -> None:
         parser.print_usage()
         return
 
+    # optional: run the commands on uvloop when it's installed
+    # (pip install wampli[uvloop]).
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
+
     func(args)
 
 
@@ -6,47 +6,86 @@ background while the actual shell runs in the foreground.
 
 import asyncio
 import cmd
-import dataclasses
-import queue
-import textwrap
+import functools
+import sys
 import threading
-from typing import Any, Dict, Iterable, Mapping, NoReturn, Optional
+from concurrent import futures
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, NoReturn, Optional, Sequence, Tuple
 
 import aiowamp
 
 import libwampli
 
-__all__ = ["Task", "STOP_SIGNAL", "worker",
+__all__ = ["Task", "STOP_SIGNAL", "worker", "WorkerHandle",
            "Shell"]
 
 # special signal to indicate that the worker thread should stop
 STOP_SIGNAL = object()
 
+# hot helpers bound once so the command handlers skip the module
+# attribute lookup per call.
+_parse_args = libwampli.parse_args
+_ready_uri = libwampli.ready_uri
+_split_function_style = libwampli.split_function_style
 
-@dataclasses.dataclass()
-class Task:
+
+class WorkerHandle:
+    """Bridge between the shell thread and a `worker`'s event loop.
+
+    The worker attaches its loop and task queue once they exist, the
+    shell submits tasks through `submit` which hands them to the loop
+    with `call_soon_threadsafe`.
+    """
+    __slots__ = ("_loop", "_queue", "_started")
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._started = threading.Event()
+
+    def _attach(self, loop: asyncio.AbstractEventLoop, q: asyncio.Queue) -> None:
+        """Attach the worker's loop and queue. Called by the worker."""
+        self._loop = loop
+        self._queue = q
+        self._started.set()
+
+    def submit(self, task: Any) -> None:
+        """Send a task to the worker.
+
+        Blocks until the worker is ready to receive tasks.
+        """
+        self._started.wait()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, task)
+
+    def stop(self) -> None:
+        """Tell the worker to stop."""
+        self.submit(STOP_SIGNAL)
+
+
+class Task(NamedTuple):
     """Task to be executed by a `worker`.
 
     Meaning of `args` and `kwargs` depend on the `action`.
 
     Attributes:
         action (str): Action to perform.
-        args (Iterable[Any]): Arguments for the action.
+        args (Sequence[Any]): Arguments for the action.
         kwargs (Mapping[str, Any]): Keyword arguments for the action.
     """
     action: str
-    args: Iterable[Any] = dataclasses.field(default_factory=list)
-    kwargs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    args: Sequence[Any] = ()
+    kwargs: Mapping[str, Any] = MappingProxyType({})
 
 
-def worker(config: libwampli.ConnectionConfig, receive: queue.Queue) -> None:
+def worker(config: libwampli.ConnectionConfig, handle: WorkerHandle) -> None:
     """Thread worker which performs async tasks.
 
-    You can send `STOP_SIGNAL` to the `receive` queue to stop the worker.
+    You can use `WorkerHandle.stop` to stop the worker.
 
     Tasks:
-        call: args and kwargs are passed to `autobahn.wamp.ISession.call`.
-        publish: args and kwargs are passed to `autobahn.wamp.ISession.publish`.
+        call: args and kwargs are passed to `aiowamp.ClientABC.call`.
+        publish: args and kwargs are passed to `aiowamp.ClientABC.publish`.
         subscribe: subscribe to a topic. The first item in args is used as the
             topic.
         unsubscribe: Unsubscribe from a topic. The first item in args is used as
@@ -54,54 +93,94 @@ def worker(config: libwampli.ConnectionConfig, receive: queue.Queue) -> None:
 
     Args:
         config: Connection config to create the connection from
-        receive: Queue to get new tasks from.
+        handle: Handle to receive new tasks through.
             As soon as the worker is running it will pull `Task` instances
-            from the queue and execute them. Each time a task is finished
-            `queue.Queue.task_done()` is called.
+            from the handle's queue and execute them.
             The special "task" `STOP_SIGNAL` stops the worker.
     """
-    loop = asyncio.new_event_loop()
+    # prefer uvloop for the worker, it drives all the WAMP I/O
+    # (pip install wampli[uvloop]).
+    try:
+        import uvloop
+    except ImportError:
+        loop = asyncio.new_event_loop()
+    else:
+        loop = uvloop.new_event_loop()
+
     asyncio.set_event_loop(loop)
 
+    # 3.12+: start tasks inline up to their first suspension, which
+    # skips a scheduler round-trip for actions that finish synchronously.
+    if hasattr(asyncio, "eager_task_factory"):
+        loop.set_task_factory(asyncio.eager_task_factory)
+
+    # tasks go straight into the loop's own queue, submissions from the
+    # shell thread arrive through call_soon_threadsafe. This keeps the
+    # dispatch loop free of executor round-trips.
+    receive: asyncio.Queue = asyncio.Queue()
+    handle._attach(loop, receive)
+
     client: Optional[aiowamp.ClientABC] = None
     client_task = loop.create_task(aiowamp.connect(config.endpoint, realm=config.realm))
 
     async def on_subscription_event(event: aiowamp.SubscriptionEventABC) -> None:
-        print(f"received event:\n{libwampli.format_args_mixin(event)}")
+        sys.stdout.write(f"received event:\n{libwampli.format_args_mixin(event)}\n")
+        sys.stdout.flush()
+
+    # the action handlers return the output for the task, empty string
+    # for none. They close over client, which runner() sets before any
+    # task is pulled.
+
+    async def do_call(task: Task) -> str:
+        try:
+            result = await client.call(*task.args, kwargs=task.kwargs)
+        except aiowamp.ErrorResponse as e:
+            return f"{e}\n"
+
+        return f"{libwampli.human_result(result)}\n"
+
+    async def do_publish(task: Task) -> str:
+        ack = client.publish(*task.args, kwargs=task.kwargs)
+        if ack is not None:
+            await ack
+
+        return "done\n"
+
+    async def do_subscribe(task: Task) -> str:
+        if not task.args:
+            return "no topic provided\n"
+
+        await client.subscribe(task.args[0], on_subscription_event)
+        return ""
+
+    async def do_unsubscribe(task: Task) -> str:
+        if not task.args:
+            return "no topic provided\n"
+
+        await client.unsubscribe(task.args[0])
+        return ""
+
+    handlers = {
+        "call": do_call,
+        "publish": do_publish,
+        "subscribe": do_subscribe,
+        "unsubscribe": do_unsubscribe,
+    }
 
     async def handle_task(task: Task) -> None:
-        nonlocal client
         assert client
 
-        if task.action == "call":
-            try:
-                result = await client.call(*task.args, kwargs=task.kwargs)
-            except aiowamp.ErrorResponse as e:
-                print(e)
-            else:
-                print(libwampli.human_result(result))
-        elif task.action == "publish":
-            ack = client.publish(*task.args, kwargs=task.kwargs)
-            if ack is not None:
-                await ack
-
-            print("done")
-        elif task.action == "subscribe":
-            try:
-                topic = next(iter(task.args))
-            except StopIteration:
-                print("no topic provided")
-            else:
-                await client.subscribe(topic, on_subscription_event)
-        elif task.action == "unsubscribe":
-            try:
-                topic = next(iter(task.args))
-            except StopIteration:
-                print("no topic provided")
-            else:
-                await client.unsubscribe(topic)
+        handler = handlers.get(task.action)
+
+        if handler is None:
+            out = f"unknown task given to worker: {task}\n"
         else:
-            print(f"unknown task given to worker: {task}")
+            out = await handler(task)
+
+        # a single write per task instead of a print per message.
+        if out:
+            sys.stdout.write(out)
+            sys.stdout.flush()
 
     async def runner() -> NoReturn:
         nonlocal client
@@ -110,34 +189,61 @@ def worker(config: libwampli.ConnectionConfig, receive: queue.Queue) -> None:
         client = await client_task
         print("connected")
 
-        async def _handle_task(_task: Task) -> None:
-            try:
-                await handle_task(_task)
-            finally:
-                receive.task_done()
-
         while True:
-            task = await loop.run_in_executor(None, receive.get)
+            batch = [await receive.get()]
+
+            # drain whatever else queued up since the last wakeup so a
+            # burst of commands costs a single loop iteration.
+            while True:
+                try:
+                    batch.append(receive.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # the membership test is a C-level scan, so the common
+            # batch doesn't pay a per-task sentinel check in Python.
+            if STOP_SIGNAL in batch:
+                # schedule what came in before the signal, drop the rest
+                for task in batch:
+                    if task is STOP_SIGNAL:
+                        break
+
+                    loop.create_task(handle_task(task))
 
-            if task is STOP_SIGNAL:
                 print("stopping worker")
                 break
-            else:
-                loop.create_task(_handle_task(task))
+
+            for task in batch:
+                loop.create_task(handle_task(task))
 
         print("waiting for connection to close!")
         await client.close()
 
-        this_task = asyncio.current_task()
-        tasks = asyncio.all_tasks(loop)
-        for task in tasks:
-            if task is not this_task:
-                task.cancel()
+        pending = asyncio.all_tasks(loop)
+        pending.discard(asyncio.current_task())
+        for task in pending:
+            task.cancel()
+
+        # wait for the cancellations to finish, otherwise loop.close()
+        # complains about pending tasks and sockets may leak.
+        await asyncio.gather(*pending, return_exceptions=True)
 
     loop.run_until_complete(runner())
     loop.close()
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_arg_line(arg: str) -> Tuple[Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]:
+    """Parse a shell input line into args and kwarg items.
+
+    Memoised because interactive input (readline history in particular)
+    repeats the same lines a lot. The results are tuples so cache
+    entries can't be mutated, callers materialise them as needed.
+    """
+    args, kwargs = _parse_args(arg)
+    return tuple(args), tuple(kwargs.items())
+
+
 # TODO alias uri
 
 class Shell(cmd.Cmd):
@@ -146,31 +252,30 @@ class Shell(cmd.Cmd):
     Args:
         config: Config to use to create the `libwampli.Connection`.
     """
-    intro = textwrap.dedent("""
-        Type 'help' or '?' to list all commands. 
-        Use 'exit' to exit the shell.
-    """).strip()
+    intro = ("Type 'help' or '?' to list all commands.\n"
+             "Use 'exit' to exit the shell.")
 
     prompt = "(WAMPli) "
 
     _connection_config: libwampli.ConnectionConfig
 
-    _send_queue: queue.Queue
-    _receive_queue: queue.Queue
-    _worker_thread: Optional[threading.Thread]
+    _worker_handle: WorkerHandle
+    _executor: Optional[futures.ThreadPoolExecutor]
+    _worker_future: Optional[futures.Future]
 
     def __init__(self, config: libwampli.ConnectionConfig) -> None:
         super().__init__()
 
         self._connection_config = config
 
-        self._send_queue = queue.Queue()
-        self._receive_queue = queue.Queue()
+        self._worker_handle = WorkerHandle()
+        self._executor = None
+        self._worker_future = None
 
     @property
     def worker_running(self) -> bool:
         """Whether the worker thread is running."""
-        return self._worker_thread and self._worker_thread.is_alive()
+        return self._worker_future is not None and not self._worker_future.done()
 
     def run(self) -> None:
         """Run the shell..
@@ -187,19 +292,44 @@ class Shell(cmd.Cmd):
             self._stop_worker()
 
     def _start_worker(self) -> None:
-        thread = threading.Thread(
-            name="Shell worker",
-            target=worker,
-            args=(self._connection_config, self._send_queue),
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="Shell worker",
+        )
+        self._worker_future = self._executor.submit(
+            worker,
+            self._connection_config, self._worker_handle,
         )
-
-        self._worker_thread = thread
-        self._worker_thread.start()
 
     def _stop_worker(self) -> None:
-        if self.worker_running:
-            self._send_queue.put(STOP_SIGNAL)
-            self._worker_thread.join(timeout=20)
+        if self._worker_future is None:
+            return
+
+        # no point in submitting the stop signal to a dead worker, but
+        # its exception still needs to be read and reported below.
+        if not self._worker_future.done():
+            self._worker_handle.stop()
+
+        try:
+            # also surfaces the exception if the worker crashed
+            self._worker_future.result(timeout=20)
+        except futures.TimeoutError:
+            print("worker didn't stop in time")
+        except Exception as e:
+            print(f"worker died with: {e!r}")
+
+        self._executor.shutdown(wait=False)
+
+    def get_names(self):
+        # cmd.Cmd runs dir() on every completion and help lookup even
+        # though the command set never changes at runtime.
+        cls = type(self)
+        names = cls.__dict__.get("_cached_names")
+        if names is None:
+            names = dir(cls)
+            cls._cached_names = names
+
+        return names
 
     def do_exit(self, _) -> bool:
         """Exit the shell."""
@@ -213,44 +343,45 @@ class Shell(cmd.Cmd):
         as if they were call commands.
         Otherwise the base class' method is used.
         """
-        args = libwampli.split_function_style(line)
+        args = _split_function_style(line)
         if args:
-            args, kwargs = libwampli.parse_args(args)
+            args, kwargs = _parse_args(args)
             self._call(args, kwargs)
         else:
             super().default(line)
 
     def _call(self, args, kwargs) -> None:
-        libwampli.ready_uri(args)
+        _ready_uri(args)
 
-        task = Task("call", args, kwargs)
-        self._send_queue.put_nowait(task)
+        task = Task("call", tuple(args), kwargs)
+        self._worker_handle.submit(task)
 
     def do_call(self, arg: str) -> None:
         """Call a procedure."""
-        args, kwargs = libwampli.parse_args(arg)
-        self._call(args, kwargs)
+        args, kwargs = _parse_arg_line(arg)
+        self._call(list(args), dict(kwargs))
 
     def do_publish(self, arg: str) -> None:
         """Publish to a topic."""
-        args, kwargs = libwampli.parse_args(arg)
-        libwampli.ready_uri(args)
+        args, kwargs = _parse_arg_line(arg)
+        args = list(args)
+        _ready_uri(args)
 
-        task = Task("publish", args, kwargs)
-        self._send_queue.put_nowait(task)
+        task = Task("publish", tuple(args), dict(kwargs))
+        self._worker_handle.submit(task)
 
     def do_subscribe(self, arg: str) -> None:
         """Subscribe to a topic"""
         args = [arg]
-        libwampli.ready_uri(args)
+        _ready_uri(args)
 
-        task = Task("subscribe", args)
-        self._send_queue.put_nowait(task)
+        task = Task("subscribe", tuple(args))
+        self._worker_handle.submit(task)
 
     def do_unsubscribe(self, arg: str) -> None:
         """Unsubscribe from a topic"""
         args = [arg]
-        libwampli.ready_uri(args)
+        _ready_uri(args)
 
-        task = Task("unsubscribe", args)
-        self._send_queue.put_nowait(task)
+        task = Task("unsubscribe", tuple(args))
+        self._worker_handle.submit(task)